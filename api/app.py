@@ -9,10 +9,13 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import API_HOST, API_PORT, INDEX_FILE, HTML_CORPUS_DIR, OFFICIAL_FILES
+from config import API_HOST, API_PORT, INDEX_FILE, HTML_CORPUS_DIR, OFFICIAL_FILES, INDEX_QUANTIZATION
 from indexer.indexer import load_index
+from indexer.spelling import load_spelling_index, build_spelling_index
+from indexer.doc_store import load_doc_store, save_doc_store, read_document
 from indexer.extractor import extract_text_from_html
 from processor.query_processor import process_query
+from processor.snippets import get_highlight_terms, generate_snippet
 from processor.word2vec_search import process_query_word2vec, create_document_embeddings
 
 app = Flask(__name__)
@@ -21,8 +24,11 @@ app = Flask(__name__)
 api_vocabulary = None
 api_tfidf_matrix = None
 api_doc_ids = None
+api_spelling_index = None
+api_doc_store = None
 
 # Global variables for Word2Vec
+api_embedding_doc_ids = None
 api_doc_embeddings = None
 
 
@@ -38,7 +44,7 @@ def search():
     Search endpoint with method selection.
     
     Expected JSON:
-        {"query": "text", "top_k": 3, "method": "tfidf" or "word2vec"}
+        {"query": "text", "top_k": 3, "method": "tfidf" or "word2vec", "snippets": true}
     """
     try:
         data = request.get_json()
@@ -49,16 +55,18 @@ def search():
         query_text = data['query']
         top_k = data.get('top_k', 3)
         method = data.get('method', 'tfidf')
+        include_snippets = data.get('snippets', False) and api_doc_store is not None
         
         # Process based on method
         if method == 'word2vec':
-            ranked_docs = process_query_word2vec(query_text, api_doc_embeddings)
+            ranked_docs = process_query_word2vec(query_text, api_embedding_doc_ids, api_doc_embeddings)
         else:
             ranked_docs = process_query(
                 query_text,
                 api_vocabulary,
                 api_tfidf_matrix,
-                api_doc_ids
+                api_doc_ids,
+                api_spelling_index
             )
         
         # Format results
@@ -70,6 +78,13 @@ def search():
                 'score': float(score)
             })
         
+        # Snippets are only generated for the returned top-k documents
+        if include_snippets:
+            highlight_terms = get_highlight_terms(query_text, api_spelling_index)
+            for result in results:
+                text = read_document(result['document_id'], api_doc_store)
+                result['snippet'] = generate_snippet(text, highlight_terms)
+        
         return jsonify({
             'query': query_text,
             'method': method,
@@ -92,12 +107,18 @@ def health():
 
 def load_index_for_api():
     """Load index and create Word2Vec embeddings"""
-    global api_vocabulary, api_tfidf_matrix, api_doc_ids, api_doc_embeddings
+    global api_vocabulary, api_tfidf_matrix, api_doc_ids, api_doc_embeddings, api_spelling_index
+    global api_doc_store, api_embedding_doc_ids
     
     print("Loading index for API...")
     api_doc_ids, api_vocabulary, api_tfidf_matrix = load_index()
     print("TF-IDF index loaded")
     
+    # Spelling index is saved with the TF-IDF index; rebuild it for older indexes
+    api_spelling_index = load_spelling_index()
+    if api_spelling_index is None:
+        api_spelling_index = build_spelling_index(api_vocabulary, api_tfidf_matrix)
+    
     # Load documents for Word2Vec
     print("\nLoading documents for Word2Vec...")
     documents = {}
@@ -108,8 +129,14 @@ def load_index_for_api():
             text = extract_text_from_html(file_path)
             documents[doc_id] = text
     
+    # Document store is saved with the index; rebuild it from the same documents
+    api_doc_store = load_doc_store()
+    if api_doc_store is None:
+        save_doc_store(documents)
+        api_doc_store = load_doc_store()
+    
     # Create Word2Vec embeddings
-    api_doc_embeddings = create_document_embeddings(documents)
+    api_embedding_doc_ids, api_doc_embeddings = create_document_embeddings(documents, INDEX_QUANTIZATION)
     print("Word2Vec embeddings ready")
     
     print("\nAPI ready with both TF-IDF and Word2Vec!")
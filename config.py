@@ -15,8 +15,13 @@ OUTPUT_DIR = DATA_DIR / 'output'
 
 # Important file paths
 INDEX_FILE = OUTPUT_DIR / 'index.json'
+SPELLING_INDEX_FILE = OUTPUT_DIR / 'spelling_index.json'
+DOC_STORE_FILE = OUTPUT_DIR / 'doc_store.bin'
+DOC_STORE_OFFSETS_FILE = OUTPUT_DIR / 'doc_store_offsets.json'
+QUANTIZATION_REPORT_FILE = OUTPUT_DIR / 'quantization_report.json'
 RESULTS_FILE = OUTPUT_DIR / 'results.csv'
 QUERIES_FILE = DATA_DIR / 'queries.csv'
+QRELS_FILE = DATA_DIR / 'qrels.csv'  # Optional relevance judgments
 
 # Crawler configuration
 CRAWLER_START_URL = 'https://en.wikipedia.org/wiki/Information_retrieval'
@@ -29,6 +34,25 @@ USE_LOWERCASE = True
 STOP_WORDS = 'english'
 TFIDF_NORM = 'l2'
 
+# Quantization settings (None keeps full precision, or 'float16' / 'int8')
+INDEX_QUANTIZATION = None
+QUANTIZATION_REPORT_QUERIES = 1000  # Queries used for the ranking agreement report
+
+# Spelling correction settings (SymSpell-style deletion dictionary)
+SPELLING_MAX_EDIT_DISTANCE = 2
+SPELLING_PREFIX_LENGTH = 7  # Only the first N characters are used for deletes
+SPELLING_MAX_CANDIDATES = 3  # Expansion terms added per misspelled query term
+SPELLING_MIN_TERM_LENGTH = 4  # Shorter query terms are never corrected
+SPELLING_SHORT_TERM_LENGTH = 5  # Terms up to this length allow only 1 edit
+
+# Document store settings
+DOC_STORE_BLOCK_SIZE = 16384  # Uncompressed bytes per zlib block
+DOC_STORE_COMPRESSION_LEVEL = 6
+
+# Snippet settings
+SNIPPET_WINDOW = 30  # Words per snippet
+SNIPPET_TIME_BUDGET_MS = 5  # Max time spent searching for the best window per result
+
 # The 3 official HTML files for grading
 OFFICIAL_FILES = [
     '0F64A61C-DF01-4F43-8B8D-F0319C41768E.html',
@@ -36,6 +60,11 @@ OFFICIAL_FILES = [
     '6B3BD97C-DEF2-49BB-B2B6-80F2CD53C4D3.html'
 ]
 
+# Batch evaluation settings
+EVAL_CHUNK_SIZE = 1000  # Queries scored per worker task
+EVAL_WORKERS = None  # Worker processes (None = CPU count, 1 = no process pool)
+EVAL_TOP_K = 10  # Results written per query and cutoff for P@k / nDCG@k
+
 # Flask API settings
 API_HOST = '127.0.0.1'
 API_PORT = 5000
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Document Store
+Stores extracted document text in compressed blocks for random access
+"""
+
+import json
+import zlib
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (DOC_STORE_FILE, DOC_STORE_OFFSETS_FILE,
+                    DOC_STORE_BLOCK_SIZE, DOC_STORE_COMPRESSION_LEVEL)
+
+
+def save_doc_store(documents):
+    """
+    Write document texts to a block-compressed store.
+
+    All texts are concatenated into one UTF-8 stream which is cut into
+    fixed-size blocks and compressed independently. The offset table
+    records where each compressed block starts and which byte range of
+    the stream belongs to each document, so a single document can be
+    read back with one seek and only the blocks it spans.
+
+    Args:
+        documents: Dictionary mapping document ID to extracted text
+    """
+    doc_table = {}
+    stream = bytearray()
+
+    for doc_id, text in documents.items():
+        data = text.encode('utf-8')
+        doc_table[doc_id] = [len(stream), len(data)]
+        stream.extend(data)
+
+    block_offsets = []
+    with open(DOC_STORE_FILE, 'wb') as f:
+        for start in range(0, len(stream), DOC_STORE_BLOCK_SIZE):
+            block = zlib.compress(
+                bytes(stream[start:start + DOC_STORE_BLOCK_SIZE]),
+                DOC_STORE_COMPRESSION_LEVEL
+            )
+            block_offsets.append(f.tell())
+            f.write(block)
+        block_offsets.append(f.tell())
+
+    offsets_data = {
+        'block_size': DOC_STORE_BLOCK_SIZE,
+        'block_offsets': block_offsets,
+        'documents': doc_table
+    }
+
+    with open(DOC_STORE_OFFSETS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(offsets_data, f)
+
+    print(f"\nDocument store saved to: {DOC_STORE_FILE}")
+    print(f"File size: {DOC_STORE_FILE.stat().st_size / 1024:.2f} KB "
+          f"({len(stream) / 1024:.2f} KB uncompressed, {len(block_offsets) - 1} blocks)")
+
+
+def load_doc_store():
+    """Load the document store offset table, or None if it was never built"""
+    if not DOC_STORE_OFFSETS_FILE.exists() or not DOC_STORE_FILE.exists():
+        print(f"Warning: Missing document store {DOC_STORE_FILE}")
+        return None
+
+    with open(DOC_STORE_OFFSETS_FILE, 'r', encoding='utf-8') as f:
+        doc_store = json.load(f)
+
+    print(f"Document store loaded: {len(doc_store['documents'])} documents")
+
+    return doc_store
+
+
+def read_document(doc_id, doc_store):
+    """
+    Read the text of a single document from the store.
+
+    Args:
+        doc_id: Document ID
+        doc_store: Offset table from load_doc_store
+
+    Returns:
+        Document text, or empty string if the document is not stored
+    """
+    if doc_id not in doc_store['documents']:
+        return ""
+
+    start, length = doc_store['documents'][doc_id]
+    if length == 0:
+        return ""
+
+    block_size = doc_store['block_size']
+    block_offsets = doc_store['block_offsets']
+    first_block = start // block_size
+    last_block = (start + length - 1) // block_size
+
+    # One seek and one read covers every block the document spans
+    with open(DOC_STORE_FILE, 'rb') as f:
+        f.seek(block_offsets[first_block])
+        raw = f.read(block_offsets[last_block + 1] - block_offsets[first_block])
+
+    data = bytearray()
+    base = block_offsets[first_block]
+    for block in range(first_block, last_block + 1):
+        data.extend(zlib.decompress(
+            raw[block_offsets[block] - base:block_offsets[block + 1] - base]
+        ))
+
+    offset = start - first_block * block_size
+    return bytes(data[offset:offset + length]).decode('utf-8')
@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from config import HTML_CORPUS_DIR, INDEX_FILE, OFFICIAL_FILES, USE_LOWERCASE, STOP_WORDS, TFIDF_NORM
 from indexer.extractor import extract_text_from_html
+from indexer.quantization import build_quantized_matrix, is_quantized
 
 
 def load_documents():
@@ -62,28 +63,58 @@ def build_index(documents):
 
 
 def save_index(doc_ids, vocabulary, tfidf_matrix):
-    """Save index to JSON file"""
+    """
+    Save index to JSON file.
+    
+    A quantized matrix (from quantize_vectors) is stored as-is: the
+    quantized postings lists plus per-document scales. float16 codes are
+    written as their 16-bit patterns, since JSON would otherwise spell out
+    every value as a long decimal float.
+    
+    Returns:
+        Size of the saved index file in bytes
+    """
     index_data = {
         'document_ids': doc_ids,
-        'vocabulary': vocabulary.tolist(),
-        'tfidf_matrix': tfidf_matrix.toarray().tolist(),
-        'vectorizer_params': {
-            'lowercase': USE_LOWERCASE,
-            'stop_words': STOP_WORDS,
-            'norm': TFIDF_NORM
+        'vocabulary': vocabulary.tolist()
+    }
+    
+    if is_quantized(tfidf_matrix):
+        codes = tfidf_matrix.codes
+        if tfidf_matrix.quantization == 'float16':
+            codes = codes.view(np.uint16)
+        index_data['tfidf_postings'] = {
+            'codes': codes.tolist(),
+            'indices': tfidf_matrix.indices.tolist(),
+            'indptr': tfidf_matrix.indptr.tolist(),
+            'shape': list(tfidf_matrix.shape)
         }
+        index_data['tfidf_scales'] = tfidf_matrix.scales.tolist()
+        index_data['quantization'] = tfidf_matrix.quantization
+    else:
+        index_data['tfidf_matrix'] = tfidf_matrix.toarray().tolist()
+    
+    index_data['vectorizer_params'] = {
+        'lowercase': USE_LOWERCASE,
+        'stop_words': STOP_WORDS,
+        'norm': TFIDF_NORM
     }
     
     # Save to file
     with open(INDEX_FILE, 'w', encoding='utf-8') as f:
         json.dump(index_data, f, indent=2)
     
+    storage = tfidf_matrix.quantization if is_quantized(tfidf_matrix) else 'full precision'
+    file_size = INDEX_FILE.stat().st_size
+    
     print(f"\nIndex saved to: {INDEX_FILE}")
-    print(f"File size: {INDEX_FILE.stat().st_size / 1024:.2f} KB")
+    print(f"File size: {file_size / 1024:.2f} KB ({storage})")
+    
+    return file_size
 
 
 def load_index():
-    """Load index from JSON file"""
+    """Load index from JSON file (quantized indexes stay quantized)"""
     print("Loading index...")
     
     with open(INDEX_FILE, 'r', encoding='utf-8') as f:
@@ -91,8 +122,24 @@ def load_index():
     
     doc_ids = index_data['document_ids']
     vocabulary = index_data['vocabulary']
-    tfidf_matrix = np.array(index_data['tfidf_matrix'])
+    quantization = index_data.get('quantization')
+    
+    if quantization is not None:
+        postings = index_data['tfidf_postings']
+        codes = postings['codes']
+        if quantization == 'float16':
+            codes = np.asarray(codes, dtype=np.uint16).view(np.float16)
+        tfidf_matrix = build_quantized_matrix(
+            codes,
+            index_data['tfidf_scales'],
+            quantization,
+            (postings['indices'], postings['indptr'], postings['shape'])
+        )
+    else:
+        tfidf_matrix = np.array(index_data['tfidf_matrix'])
     
     print(f"Index loaded: {len(doc_ids)} documents, {len(vocabulary)} terms")
+    if quantization is not None:
+        print(f"TF-IDF weights quantized to {quantization}")
     
     return doc_ids, vocabulary, tfidf_matrix
\ No newline at end of file
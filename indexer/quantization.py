@@ -0,0 +1,140 @@
+"""
+Vector Quantization
+Stores TF-IDF weights and embeddings as float16 or int8 with per-vector scales
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import numpy as np
+from scipy import sparse
+
+QUANTIZATION_TYPES = ('float16', 'int8')
+
+
+@dataclass
+class QuantizedMatrix:
+    """
+    Quantized vectors, one per row.
+
+    Dense matrices keep a 2D array of codes. Sparse matrices keep the codes
+    of every posting in CSC layout, with indices (row of each posting),
+    indptr (start of each column) and shape set.
+    """
+    quantization: str
+    codes: np.ndarray
+    scales: np.ndarray
+    norms: np.ndarray
+    indices: Optional[np.ndarray] = None
+    indptr: Optional[np.ndarray] = None
+    shape: Optional[Tuple[int, int]] = None
+
+
+def quantize_vectors(vectors, quantization):
+    """
+    Quantize each row of a matrix.
+
+    float16 rows keep a scale of 1. int8 rows are scaled so that the
+    largest absolute weight maps to 127; nonzero weights never round to
+    zero, so the set of postings is unchanged. For a sparse matrix only
+    the stored weights are quantized and its postings structure is kept.
+
+    Args:
+        vectors: Dense 2D array or sparse matrix, one vector per row
+        quantization: 'float16' or 'int8'
+
+    Returns:
+        Quantized matrix (see build_quantized_matrix)
+    """
+    if quantization not in QUANTIZATION_TYPES:
+        raise ValueError(f"Unknown quantization type: {quantization}")
+
+    postings = None
+    if sparse.issparse(vectors):
+        # CSC: one postings list (column) per term, rows are documents
+        vectors = sparse.csc_matrix(vectors, dtype=np.float64)
+        vectors.sort_indices()
+        weights = vectors.data
+        rows = vectors.indices
+        max_abs = abs(vectors).max(axis=1).toarray().ravel()
+        postings = (vectors.indices, vectors.indptr, vectors.shape)
+    else:
+        vectors = np.asarray(vectors, dtype=np.float64)
+        weights = vectors
+        rows = (slice(None), None)
+        max_abs = np.abs(vectors).max(axis=1) if vectors.size else np.zeros(len(vectors))
+
+    if quantization == 'float16':
+        scales = np.ones(vectors.shape[0], dtype=np.float32)
+        codes = weights.astype(np.float16)
+    else:
+        scales = np.where(max_abs > 0, max_abs / 127, 1.0).astype(np.float32)
+        codes = np.rint(weights / scales[rows]).astype(np.int8)
+
+        # Keep tiny weights as +/-1 instead of dropping the posting
+        lost = (codes == 0) & (weights != 0)
+        codes[lost] = np.sign(weights[lost]).astype(np.int8)
+
+    return build_quantized_matrix(codes, scales, quantization, postings)
+
+
+def build_quantized_matrix(codes, scales, quantization, postings=None):
+    """
+    Bundle quantized codes with their scales and row norms.
+
+    Sparse matrices are kept as postings lists (CSC layout) so scoring only
+    touches the postings of the query terms. Document and offset indices
+    use the smallest integer type that fits.
+
+    Args:
+        codes: Dense 2D array of codes, or the codes of every posting
+        scales: Per-row scale factors
+        quantization: 'float16' or 'int8'
+        postings: Optional (indices, indptr, shape) for sparse codes
+
+    Returns:
+        QuantizedMatrix with row norms computed
+    """
+    dtype = np.float16 if quantization == 'float16' else np.int8
+    codes = np.asarray(codes, dtype=dtype)
+    scales = np.asarray(scales, dtype=np.float32)
+
+    indices = indptr = shape = None
+    if postings is not None:
+        indices, indptr, shape = postings
+        num_rows, num_columns = shape
+        indices = np.asarray(indices).astype(np.min_scalar_type(max(num_rows - 1, 0)))
+        indptr = np.asarray(indptr).astype(np.min_scalar_type(len(codes)))
+
+        squared = codes.astype(np.float32) ** 2
+        row_norms = np.sqrt(np.bincount(indices, weights=squared, minlength=num_rows))
+        shape = (int(num_rows), int(num_columns))
+    else:
+        row_norms = np.zeros(len(codes), dtype=np.float32)
+        for row in range(len(codes)):
+            row_codes = codes[row].astype(np.float32)
+            row_norms[row] = np.sqrt(row_codes @ row_codes)
+
+    # Norms of the dequantized rows, needed for cosine similarity
+    norms = (row_norms * scales).astype(np.float32)
+
+    return QuantizedMatrix(quantization, codes, scales, norms, indices, indptr, shape)
+
+
+def is_quantized(matrix):
+    """Check whether a matrix was produced by quantize_vectors"""
+    return isinstance(matrix, QuantizedMatrix)
+
+
+def is_sparse_quantized(matrix):
+    """Check whether a quantized matrix stores postings lists"""
+    return is_quantized(matrix) and matrix.indptr is not None
+
+
+def get_memory_usage(matrix):
+    """Bytes used by a dense, sparse or quantized matrix"""
+    if is_quantized(matrix):
+        arrays = (matrix.codes, matrix.scales, matrix.norms, matrix.indices, matrix.indptr)
+        return sum(array.nbytes for array in arrays if array is not None)
+    if sparse.issparse(matrix):
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    return np.asarray(matrix).nbytes
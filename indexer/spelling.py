@@ -0,0 +1,224 @@
+"""
+Spelling Index
+Builds a SymSpell-style deletion dictionary over the index vocabulary
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (SPELLING_INDEX_FILE, SPELLING_MAX_EDIT_DISTANCE,
+                    SPELLING_PREFIX_LENGTH, SPELLING_MAX_CANDIDATES,
+                    SPELLING_MIN_TERM_LENGTH, SPELLING_SHORT_TERM_LENGTH)
+from indexer.quantization import is_quantized, is_sparse_quantized
+
+
+def generate_deletes(word, max_edit_distance):
+    """
+    Generate every string reachable from word by removing up to
+    max_edit_distance characters.
+
+    Args:
+        word: Term (or term prefix) to generate deletes for
+        max_edit_distance: Maximum number of characters to remove
+
+    Returns:
+        Set of delete strings, including the word itself
+    """
+    deletes = {word}
+    current = {word}
+
+    for _ in range(max_edit_distance):
+        next_level = set()
+        for item in current:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                next_level.add(item[:i] + item[i + 1:])
+        next_level -= deletes
+        deletes |= next_level
+        current = next_level
+
+    return deletes
+
+
+def edit_distance(source, target, max_distance):
+    """
+    Damerau-Levenshtein (optimal string alignment) distance.
+
+    Args:
+        source: First string
+        target: Second string
+        max_distance: Distances above this value are not needed
+
+    Returns:
+        Edit distance, or max_distance + 1 if it is exceeded
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(target) + 1))
+
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,         # Deletion
+                current[j - 1] + 1,      # Insertion
+                previous[j - 1] + cost   # Substitution
+            )
+            # Transposition of two adjacent characters
+            if (i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+
+        # Stop early once every alignment is already too expensive
+        if min(current) > max_distance and min(previous) >= max_distance:
+            return max_distance + 1
+
+        previous_previous, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+
+def build_spelling_index(vocabulary, tfidf_matrix):
+    """
+    Build a deletion dictionary from the index vocabulary.
+
+    Each term's prefix is expanded into all of its deletes so that
+    candidate lookup at query time is a handful of dictionary hits
+    instead of a scan over the whole vocabulary. Deletes point to term
+    ids rather than repeating the term strings.
+
+    Args:
+        vocabulary: List of terms from index
+        tfidf_matrix: Document TF-IDF matrix (dense, sparse or quantized)
+
+    Returns:
+        Dictionary with terms, their frequencies and the deletes mapping
+    """
+    print("\nBuilding spelling index...")
+
+    # Document frequency of each term, used to rank corrections
+    if is_sparse_quantized(tfidf_matrix):
+        doc_freqs = np.diff(tfidf_matrix.indptr.astype(np.int64))
+    else:
+        if is_quantized(tfidf_matrix):
+            tfidf_matrix = tfidf_matrix.codes
+        doc_freqs = np.asarray((tfidf_matrix != 0).sum(axis=0)).ravel()
+
+    terms = [str(term) for term in vocabulary]
+    deletes = {}
+
+    for term_id, term in enumerate(terms):
+        prefix = term[:SPELLING_PREFIX_LENGTH]
+        for delete in generate_deletes(prefix, SPELLING_MAX_EDIT_DISTANCE):
+            deletes.setdefault(delete, []).append(term_id)
+
+    print(f"Spelling index built: {len(terms)} terms, {len(deletes)} deletes")
+
+    spelling_index = {
+        'max_edit_distance': SPELLING_MAX_EDIT_DISTANCE,
+        'prefix_length': SPELLING_PREFIX_LENGTH,
+        'terms': terms,
+        'frequencies': [int(doc_freq) for doc_freq in doc_freqs],
+        'deletes': deletes,
+        'term_ids': {term: term_id for term_id, term in enumerate(terms)}
+    }
+
+    return spelling_index
+
+
+def save_spelling_index(spelling_index):
+    """Save spelling index to JSON file (term_ids is rebuilt on load)"""
+    index_data = {key: value for key, value in spelling_index.items() if key != 'term_ids'}
+
+    with open(SPELLING_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index_data, f, separators=(',', ':'))
+
+    print(f"Spelling index saved to: {SPELLING_INDEX_FILE}")
+    print(f"File size: {SPELLING_INDEX_FILE.stat().st_size / 1024:.2f} KB")
+
+
+def load_spelling_index():
+    """Load spelling index from JSON file, or None if it was never built"""
+    if not SPELLING_INDEX_FILE.exists():
+        print(f"Warning: Missing spelling index {SPELLING_INDEX_FILE}")
+        return None
+
+    with open(SPELLING_INDEX_FILE, 'r', encoding='utf-8') as f:
+        spelling_index = json.load(f)
+
+    terms = spelling_index['terms']
+    spelling_index['term_ids'] = {term: term_id for term_id, term in enumerate(terms)}
+
+    print(f"Spelling index loaded: {len(terms)} terms")
+
+    return spelling_index
+
+
+def get_max_edit_distance(term, spelling_index):
+    """
+    Number of edits allowed when correcting a term.
+
+    Short terms and terms containing digits (numbers, IDs) are not
+    corrected at all, and medium-length terms allow a single edit.
+    """
+    if len(term) < SPELLING_MIN_TERM_LENGTH or any(char.isdigit() for char in term):
+        return 0
+    if len(term) <= SPELLING_SHORT_TERM_LENGTH:
+        return min(1, spelling_index['max_edit_distance'])
+    return spelling_index['max_edit_distance']
+
+
+def lookup_term(term, spelling_index, max_candidates=SPELLING_MAX_CANDIDATES):
+    """
+    Find the closest vocabulary terms for a (possibly misspelled) term.
+
+    Args:
+        term: Query term
+        spelling_index: Index from build_spelling_index or load_spelling_index
+        max_candidates: Maximum number of suggestions to return
+
+    Returns:
+        List of tuples: (term, distance, frequency), closest first
+    """
+    terms = spelling_index['terms']
+    frequencies = spelling_index['frequencies']
+    term_ids = spelling_index['term_ids']
+
+    if term in term_ids:
+        return [(term, 0, frequencies[term_ids[term]])]
+
+    max_edit_distance = get_max_edit_distance(term, spelling_index)
+    if max_edit_distance == 0:
+        return []
+
+    prefix = term[:spelling_index['prefix_length']]
+    suggestions = {}
+
+    for delete in generate_deletes(prefix, max_edit_distance):
+        for candidate_id in spelling_index['deletes'].get(delete, []):
+            if candidate_id in suggestions:
+                continue
+            suggestions[candidate_id] = edit_distance(term, terms[candidate_id], max_edit_distance)
+
+    # Keep only the closest matches, most frequent first
+    matches = [
+        (terms[candidate_id], distance, frequencies[candidate_id])
+        for candidate_id, distance in suggestions.items()
+        if distance <= max_edit_distance
+    ]
+    if not matches:
+        return []
+
+    best_distance = min(distance for _, distance, _ in matches)
+    matches = [match for match in matches if match[1] == best_distance]
+    matches.sort(key=lambda x: (-x[2], x[0]))
+
+    return matches[:max_candidates]
+
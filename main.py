@@ -11,8 +11,11 @@ sys.path.append(str(Path(__file__).parent))
 from indexer.utils import create_directories
 from indexer.indexer import load_documents, build_index, save_index, load_index
 from indexer.utils import get_index_stats
-from processor.query_processor import process_all_queries, save_results
-from config import DEMO_CORPUS_DIR
+from indexer.spelling import build_spelling_index, save_spelling_index
+from indexer.doc_store import save_doc_store
+from indexer.quantization import quantize_vectors
+from processor.evaluator import evaluate_queries, measure_ranking_agreement
+from config import DEMO_CORPUS_DIR, INDEX_QUANTIZATION
 
 
 def check_demo_corpus():
@@ -75,25 +78,36 @@ def main():
     doc_ids, vocabulary, tfidf_matrix = build_index(documents)
     
     print("\nStep 4: Saving index")
-    save_index(doc_ids, vocabulary, tfidf_matrix)
+    # The quantized matrix (if enabled) is what gets saved, served and evaluated
+    index_matrix = tfidf_matrix
+    if INDEX_QUANTIZATION is not None:
+        index_matrix = quantize_vectors(tfidf_matrix, INDEX_QUANTIZATION)
+    index_file_bytes = save_index(doc_ids, vocabulary, index_matrix)
+    spelling_index = build_spelling_index(vocabulary, tfidf_matrix)
+    save_spelling_index(spelling_index)
+    save_doc_store(documents)
     
     print("\nStep 5: Displaying index statistics")
     # Convert to numpy array before passing to get_index_stats
-    import numpy as np
-    if not isinstance(tfidf_matrix, np.ndarray):
-        tfidf_matrix = tfidf_matrix.toarray()
-    get_index_stats(doc_ids, vocabulary, tfidf_matrix)
+    get_index_stats(doc_ids, vocabulary, tfidf_matrix.toarray())
     
-    print("\nStep 6: Processing queries")
-    results = process_all_queries(vocabulary, tfidf_matrix, doc_ids)
+    # Check how much quantization changes rankings before serving it
+    if INDEX_QUANTIZATION is not None:
+        measure_ranking_agreement(vocabulary, tfidf_matrix, index_matrix, doc_ids, index_file_bytes)
     
-    print("\nStep 7: Saving results")
-    save_results(results)
+    print("\nStep 6: Processing queries and saving results")
+    # A handful of queries does not need a process pool
+    evaluate_queries(vocabulary, index_matrix, doc_ids, spelling_index, workers=1)
     
     print("\nAll steps completed successfully")
     print("\nGenerated files:")
     print("  - data/output/index.json")
+    print("  - data/output/spelling_index.json")
+    print("  - data/output/doc_store.bin")
+    print("  - data/output/doc_store_offsets.json")
     print("  - data/output/results.csv")
+    if INDEX_QUANTIZATION is not None:
+        print("  - data/output/quantization_report.json")
     print("\nTo start the Flask API, run:")
     print("  python api/app.py")
 
@@ -0,0 +1,359 @@
+"""
+Batch Evaluator
+Streams large query files through the ranker and computes IR metrics
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (QUERIES_FILE, RESULTS_FILE, QRELS_FILE, EVAL_CHUNK_SIZE,
+                    EVAL_WORKERS, EVAL_TOP_K, QUANTIZATION_REPORT_FILE,
+                    QUANTIZATION_REPORT_QUERIES)
+from indexer.quantization import get_memory_usage
+from processor.query_processor import vectorize_queries
+from processor.similarity import compute_cosine_similarities, rank_top_k
+
+
+# Index state for the current (worker) process
+eval_vocabulary = None
+eval_tfidf_matrix = None
+eval_doc_ids = None
+eval_spelling_index = None
+eval_top_k = None
+
+
+def init_worker(vocabulary, tfidf_matrix, doc_ids, spelling_index, top_k):
+    """Store the index in module globals so each worker receives it only once"""
+    global eval_vocabulary, eval_tfidf_matrix, eval_doc_ids, eval_spelling_index, eval_top_k
+
+    eval_vocabulary = vocabulary
+    eval_tfidf_matrix = tfidf_matrix
+    eval_doc_ids = doc_ids
+    eval_spelling_index = spelling_index
+    eval_top_k = top_k
+
+
+def score_chunk(chunk):
+    """
+    Rank documents for a chunk of queries.
+
+    Args:
+        chunk: List of (query_id, query_text) tuples
+
+    Returns:
+        List of tuples: (query_id, ranked_docs)
+    """
+    query_texts = [query_text for _, query_text in chunk]
+    query_vectors = vectorize_queries(query_texts, eval_vocabulary, eval_spelling_index)
+    similarities = compute_cosine_similarities(query_vectors, eval_tfidf_matrix)
+
+    return [
+        (query_id, rank_top_k(eval_doc_ids, similarities[row], eval_top_k))
+        for row, (query_id, _) in enumerate(chunk)
+    ]
+
+
+def iter_queries(queries_file):
+    """Lazily yield (query_id, query_text) tuples from a queries CSV file"""
+    with open(queries_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield row['query_id'], row['query_text']
+
+
+def iter_chunks(items, chunk_size):
+    """Group an iterable into lists of at most chunk_size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def imap_bounded(pool, func, items, max_pending):
+    """
+    Ordered pool.imap that keeps at most max_pending tasks in flight.
+
+    Pool.imap reads its whole input up front, which would load the entire
+    query file into memory.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def load_qrels(qrels_file):
+    """
+    Load relevance judgments from CSV file.
+
+    Expected columns: query_id, document_id, relevance
+
+    Returns:
+        Dictionary mapping query ID to {document_id: relevance}
+    """
+    qrels = {}
+
+    print("Loading qrels...")
+    with open(qrels_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            qrels.setdefault(row['query_id'], {})[row['document_id']] = int(row['relevance'])
+
+    print(f"Loaded judgments for {len(qrels)} queries")
+    return qrels
+
+
+def precision_at_k(ranked_doc_ids, judgments, k):
+    """Fraction of the top k documents that are relevant"""
+    relevant = sum(1 for doc_id in ranked_doc_ids[:k] if judgments.get(doc_id, 0) > 0)
+    return relevant / k
+
+
+def average_precision(ranked_doc_ids, judgments):
+    """
+    Average of precision values at each relevant document's rank.
+
+    Relevant documents missing from ranked_doc_ids count as misses, so a
+    truncated ranking gives AP at that cutoff.
+    """
+    total_relevant = sum(1 for relevance in judgments.values() if relevance > 0)
+    if total_relevant == 0:
+        return 0.0
+
+    hits = 0
+    precision_sum = 0.0
+    for rank, doc_id in enumerate(ranked_doc_ids, start=1):
+        if judgments.get(doc_id, 0) > 0:
+            hits += 1
+            precision_sum += hits / rank
+
+    return precision_sum / total_relevant
+
+
+def ndcg_at_k(ranked_doc_ids, judgments, k):
+    """Normalized discounted cumulative gain with graded relevance"""
+    def dcg(relevances):
+        return sum(
+            (2 ** relevance - 1) / math.log2(rank + 1)
+            for rank, relevance in enumerate(relevances, start=1)
+        )
+
+    ideal = dcg(sorted(judgments.values(), reverse=True)[:k])
+    if ideal == 0:
+        return 0.0
+
+    return dcg([judgments.get(doc_id, 0) for doc_id in ranked_doc_ids[:k]]) / ideal
+
+
+def evaluate_queries(vocabulary, tfidf_matrix, doc_ids, spelling_index=None,
+                     queries_file=QUERIES_FILE, results_file=RESULTS_FILE,
+                     qrels_file=QRELS_FILE, top_k=EVAL_TOP_K,
+                     chunk_size=EVAL_CHUNK_SIZE, workers=EVAL_WORKERS):
+    """
+    Rank every query in a file, writing results and metrics in a single pass.
+
+    Queries are read lazily and scored in chunks, results are appended to
+    the CSV file as each chunk finishes, and metrics are kept as running
+    sums, so memory use does not grow with the number of queries.
+
+    Args:
+        vocabulary: List of terms from index
+        tfidf_matrix: Document TF-IDF matrix
+        doc_ids: List of document IDs
+        spelling_index: Optional spelling index used to expand misspelled terms
+        queries_file: CSV file with query_id, query_text columns
+        results_file: Output CSV file
+        qrels_file: Optional CSV file with relevance judgments
+        top_k: Results written per query and metric cutoff
+        chunk_size: Queries scored per task
+        workers: Number of worker processes (1 scores in this process)
+
+    Returns:
+        Dictionary of query counts and mean metrics
+    """
+    qrels = None
+    if qrels_file is not None and Path(qrels_file).exists():
+        qrels = load_qrels(qrels_file)
+
+    workers = workers or os.cpu_count() or 1
+    init_args = (vocabulary, tfidf_matrix, doc_ids, spelling_index, top_k)
+    chunks = iter_chunks(iter_queries(queries_file), chunk_size)
+
+    num_queries = 0
+    num_judged = 0
+    precision_sum = 0.0
+    ap_sum = 0.0
+    ndcg_sum = 0.0
+
+    print(f"\nEvaluating queries from {queries_file} ({workers} workers)...")
+
+    pool = None
+    if workers > 1:
+        pool = Pool(workers, initializer=init_worker, initargs=init_args)
+        scored_chunks = imap_bounded(pool, score_chunk, chunks, workers * 2)
+    else:
+        init_worker(*init_args)
+        scored_chunks = map(score_chunk, chunks)
+
+    try:
+        with open(results_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['query_id', 'rank', 'document_id'])
+
+            for scored_chunk in scored_chunks:
+                for query_id, ranked_docs in scored_chunk:
+                    writer.writerows(
+                        (query_id, rank, doc_id) for doc_id, rank, _ in ranked_docs
+                    )
+                    num_queries += 1
+
+                    if qrels is not None and query_id in qrels:
+                        ranked_doc_ids = [doc_id for doc_id, _, _ in ranked_docs]
+                        judgments = qrels[query_id]
+                        precision_sum += precision_at_k(ranked_doc_ids, judgments, top_k)
+                        ap_sum += average_precision(ranked_doc_ids, judgments)
+                        ndcg_sum += ndcg_at_k(ranked_doc_ids, judgments, top_k)
+                        num_judged += 1
+
+                f.flush()
+                print(f"Processed {num_queries} queries")
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    summary = {'queries': num_queries, 'judged_queries': num_judged}
+
+    print(f"\nResults saved to: {results_file}")
+    print(f"Total queries: {num_queries}")
+
+    if num_judged > 0:
+        summary[f'P@{top_k}'] = precision_sum / num_judged
+        summary[f'MAP@{top_k}'] = ap_sum / num_judged
+        summary[f'nDCG@{top_k}'] = ndcg_sum / num_judged
+
+        print(f"Judged queries: {num_judged}")
+        print(f"P@{top_k}: {summary[f'P@{top_k}']:.4f}")
+        print(f"MAP@{top_k}: {summary[f'MAP@{top_k}']:.4f}")
+        print(f"nDCG@{top_k}: {summary[f'nDCG@{top_k}']:.4f}")
+
+    return summary
+
+
+def measure_ranking_agreement(vocabulary, tfidf_matrix, quantized_matrix, doc_ids,
+                              index_file_bytes=None, queries_file=QUERIES_FILE,
+                              top_k=EVAL_TOP_K, max_queries=QUANTIZATION_REPORT_QUERIES):
+    """
+    Compare rankings from a quantized matrix against full precision.
+
+    Args:
+        vocabulary: List of terms from index
+        tfidf_matrix: Full precision TF-IDF matrix
+        quantized_matrix: Quantized version of tfidf_matrix
+        doc_ids: List of document IDs
+        index_file_bytes: Optional size of the saved quantized index file
+        queries_file: CSV file with queries to rank
+        top_k: Cutoff for top-k overlap
+        max_queries: Number of queries read from queries_file
+
+    Returns:
+        Dictionary with agreement and memory statistics
+    """
+    print(f"\nMeasuring {quantized_matrix.quantization} ranking agreement...")
+
+    num_queries = 0
+    top1_matches = 0
+    overlap_sum = 0.0
+    max_score_error = 0.0
+
+    queries = islice(iter_queries(queries_file), max_queries)
+    for chunk in iter_chunks(queries, EVAL_CHUNK_SIZE):
+        query_vectors = vectorize_queries([text for _, text in chunk], vocabulary)
+        full_scores = compute_cosine_similarities(query_vectors, tfidf_matrix)
+        quantized_scores = compute_cosine_similarities(query_vectors, quantized_matrix)
+
+        max_score_error = max(max_score_error, float(abs(full_scores - quantized_scores).max()))
+
+        for row in range(len(chunk)):
+            full_top = [doc_id for doc_id, _, _ in rank_top_k(doc_ids, full_scores[row], top_k)]
+            quantized_top = [doc_id for doc_id, _, _ in rank_top_k(doc_ids, quantized_scores[row], top_k)]
+
+            top1_matches += full_top[0] == quantized_top[0]
+            overlap_sum += len(set(full_top) & set(quantized_top)) / len(full_top)
+            num_queries += 1
+
+    full_bytes = get_memory_usage(tfidf_matrix)
+    quantized_bytes = get_memory_usage(quantized_matrix)
+
+    report = {
+        'quantization': quantized_matrix.quantization,
+        'queries': num_queries,
+        'top1_agreement': top1_matches / num_queries if num_queries else None,
+        f'overlap@{top_k}': overlap_sum / num_queries if num_queries else None,
+        'max_score_error': max_score_error,
+        'full_precision_bytes': full_bytes,
+        'quantized_bytes': quantized_bytes,
+        'compression_ratio': full_bytes / quantized_bytes if quantized_bytes else None,
+        'index_file_bytes': index_file_bytes
+    }
+
+    with open(QUANTIZATION_REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Queries compared: {num_queries}")
+    if num_queries:
+        print(f"Top-1 agreement: {report['top1_agreement']:.4f}")
+        print(f"Overlap@{top_k}: {report[f'overlap@{top_k}']:.4f}")
+    print(f"Max score error: {max_score_error:.6f}")
+    print(f"Memory: {full_bytes / 1024:.2f} KB -> {quantized_bytes / 1024:.2f} KB")
+    if index_file_bytes is not None:
+        print(f"Index file: {index_file_bytes / 1024:.2f} KB")
+    print(f"Report saved to: {QUANTIZATION_REPORT_FILE}")
+
+    return report
+
+
+def main():
+    """Evaluate a query file against the saved index"""
+    from indexer.indexer import load_index
+    from indexer.spelling import load_spelling_index
+
+    parser = argparse.ArgumentParser(description='Streaming batch query evaluation')
+    parser.add_argument('--queries', default=QUERIES_FILE, help='Queries CSV file')
+    parser.add_argument('--qrels', default=QRELS_FILE, help='Relevance judgments CSV file')
+    parser.add_argument('--output', default=RESULTS_FILE, help='Results CSV file')
+    parser.add_argument('--top-k', type=int, default=EVAL_TOP_K)
+    parser.add_argument('--chunk-size', type=int, default=EVAL_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=EVAL_WORKERS)
+    args = parser.parse_args()
+
+    doc_ids, vocabulary, tfidf_matrix = load_index()
+    spelling_index = load_spelling_index()
+
+    evaluate_queries(
+        vocabulary, tfidf_matrix, doc_ids, spelling_index,
+        queries_file=args.queries,
+        results_file=args.output,
+        qrels_file=args.qrels,
+        top_k=args.top_k,
+        chunk_size=args.chunk_size,
+        workers=args.workers
+    )
+
+
+if __name__ == '__main__':
+    main()
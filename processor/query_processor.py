@@ -3,56 +3,103 @@ Query Processor
 Handles query processing and document ranking
 """
 
-import csv
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import QUERIES_FILE, RESULTS_FILE, USE_LOWERCASE, STOP_WORDS, TFIDF_NORM
+from config import USE_LOWERCASE, STOP_WORDS, TFIDF_NORM
+from indexer.spelling import lookup_term
 from processor.similarity import compute_cosine_similarity, rank_documents
 
 
-def load_queries():
-    """Load queries from CSV file"""
-    queries = []
+def expand_query_terms(query_terms, spelling_index):
+    """
+    Replace out-of-vocabulary query terms with weighted spelling corrections.
+    
+    Args:
+        query_terms: Analyzed query tokens
+        spelling_index: Spelling index for the index vocabulary
+        
+    Returns:
+        Dictionary mapping vocabulary term to added query weight
+    """
+    expansions = {}
     
-    print("Loading queries...")
-    with open(QUERIES_FILE, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            queries.append({
-                'query_id': row['query_id'],
-                'query_text': row['query_text']
-            })
+    for term in query_terms:
+        if term in spelling_index['term_ids']:
+            continue
+        
+        candidates = lookup_term(term, spelling_index)
+        if not candidates:
+            continue
+        
+        # Split one term's worth of weight across the candidates,
+        # discounted by how far each correction is from the query term
+        total_freq = sum(freq for _, _, freq in candidates) or len(candidates)
+        for candidate, distance, freq in candidates:
+            share = (freq or 1) / total_freq
+            weight = share / (1 + distance)
+            expansions[candidate] = expansions.get(candidate, 0.0) + weight
     
-    print(f"Loaded {len(queries)} queries")
-    return queries
+    return expansions
 
 
-def process_query(query_text, vocabulary, tfidf_matrix, doc_ids):
+def vectorize_queries(query_texts, vocabulary, spelling_index=None):
     """
-    Process a single query and return ranked documents.
+    Convert queries to TF-IDF vectors in the index vocabulary.
+    
+    Each query's IDF is constant across its own terms, so query vectors
+    are normalized term counts (plus any spelling expansions).
     
     Args:
-        query_text: The search query
+        query_texts: List of search queries
         vocabulary: List of terms from index
-        tfidf_matrix: Document TF-IDF matrix
-        doc_ids: List of document IDs
+        spelling_index: Optional spelling index used to expand misspelled terms
         
     Returns:
-        List of tuples: (doc_id, rank, score)
+        Sparse matrix with one row per query
     """
     # Create vectorizer with same vocabulary as index
     query_vectorizer = TfidfVectorizer(
         lowercase=USE_LOWERCASE,
         stop_words=STOP_WORDS,
         vocabulary=vocabulary,
-        norm=TFIDF_NORM
+        use_idf=False,
+        norm=None
     )
     
+    # Transform queries to term count vectors
+    query_vectors = query_vectorizer.fit_transform(query_texts).tolil()
+    
+    # Add spelling corrections for terms missing from the vocabulary
+    if spelling_index is not None:
+        analyzer = query_vectorizer.build_analyzer()
+        for row, query_text in enumerate(query_texts):
+            expansions = expand_query_terms(analyzer(query_text), spelling_index)
+            for term, weight in expansions.items():
+                query_vectors[row, query_vectorizer.vocabulary_[term]] += weight
+    
+    return normalize(query_vectors.tocsr(), norm=TFIDF_NORM)
+
+
+def process_query(query_text, vocabulary, tfidf_matrix, doc_ids, spelling_index=None):
+    """
+    Process a single query and return ranked documents.
+    
+    Args:
+        query_text: The search query
+        vocabulary: List of terms from index
+        tfidf_matrix: Document TF-IDF matrix
+        doc_ids: List of document IDs
+        spelling_index: Optional spelling index used to expand misspelled terms
+        
+    Returns:
+        List of tuples: (doc_id, rank, score)
+    """
     # Transform query to TF-IDF vector
-    query_vector = query_vectorizer.fit_transform([query_text]).toarray()
+    query_vector = vectorize_queries([query_text], vocabulary, spelling_index)
     
     # Calculate similarity scores
     similarities = compute_cosine_similarity(query_vector, tfidf_matrix)
@@ -61,44 +108,3 @@ def process_query(query_text, vocabulary, tfidf_matrix, doc_ids):
     ranked_results = rank_documents(doc_ids, similarities)
     
     return ranked_results
-
-
-def process_all_queries(vocabulary, tfidf_matrix, doc_ids):
-    """Process all queries and collect results"""
-    queries = load_queries()
-    all_results = []
-    
-    print("\nProcessing queries...")
-    for query in queries:
-        query_id = query['query_id']
-        query_text = query['query_text']
-        
-        print(f"\nQuery: '{query_text}'")
-        
-        # Get ranked documents
-        ranked_docs = process_query(query_text, vocabulary, tfidf_matrix, doc_ids)
-        
-        # Display results
-        print("Results:")
-        for doc_id, rank, score in ranked_docs:
-            print(f"  Rank {rank}: {doc_id} (score: {score:.4f})")
-            
-            # Add to results list
-            all_results.append({
-                'query_id': query_id,
-                'rank': rank,
-                'document_id': doc_id
-            })
-    
-    return all_results
-
-
-def save_results(results):
-    """Save query results to CSV file"""
-    with open(RESULTS_FILE, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['query_id', 'rank', 'document_id'])
-        writer.writeheader()
-        writer.writerows(results)
-    
-    print(f"\nResults saved to: {RESULTS_FILE}")
-    print(f"Total entries: {len(results)}")
\ No newline at end of file
@@ -3,7 +3,13 @@ Similarity calculations for ranking documents
 """
 
 from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
 import numpy as np
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from indexer.quantization import is_quantized, is_sparse_quantized
 
 
 def compute_cosine_similarity(query_vector, document_matrix):
@@ -12,12 +18,83 @@ def compute_cosine_similarity(query_vector, document_matrix):
     
     Args:
         query_vector: TF-IDF vector for query
-        document_matrix: TF-IDF matrix for all documents
+        document_matrix: TF-IDF matrix for all documents (may be quantized)
         
     Returns:
         Array of similarity scores
     """
-    similarities = cosine_similarity(query_vector, document_matrix)[0]
+    similarities = compute_cosine_similarities(query_vector, document_matrix)[0]
+    return similarities
+
+
+def compute_cosine_similarities(query_vectors, document_matrix):
+    """
+    Compute cosine similarity between several queries and all documents.
+    
+    Args:
+        query_vectors: Matrix with one query vector per row
+        document_matrix: TF-IDF matrix for all documents (may be quantized)
+        
+    Returns:
+        Array of shape (num_queries, num_documents)
+    """
+    if is_quantized(document_matrix):
+        return quantized_cosine_similarity(query_vectors, document_matrix)
+    return cosine_similarity(query_vectors, document_matrix)
+
+
+def quantized_cosine_similarity(query_vectors, quantized_matrix):
+    """
+    Cosine similarity against a quantized matrix without dequantizing it.
+    
+    For sparse (postings) codes this is a sparse x sparse product over
+    only the postings lists of the query terms. Per-row scales and
+    precomputed norms are applied to the resulting dot products.
+    
+    Args:
+        query_vectors: Dense or sparse matrix with one query per row
+        quantized_matrix: Matrix from indexer.quantization.quantize_vectors
+        
+    Returns:
+        Array of shape (num_queries, num_documents)
+    """
+    codes = quantized_matrix.codes
+    
+    if is_sparse_quantized(quantized_matrix):
+        query_vectors = sparse.csr_matrix(query_vectors)
+        columns = np.unique(query_vectors.indices)
+        
+        # Gather only the postings lists of the query terms
+        indptr = quantized_matrix.indptr
+        starts = indptr[columns].astype(np.int64)
+        ends = indptr[columns + 1].astype(np.int64)
+        positions = np.concatenate(
+            [np.arange(start, end) for start, end in zip(starts, ends)]
+            + [np.zeros(0, dtype=np.int64)]
+        )
+        document_part = sparse.csc_matrix(
+            (
+                codes[positions].astype(np.float32),
+                quantized_matrix.indices[positions].astype(np.int32),
+                np.concatenate([[0], np.cumsum(ends - starts)])
+            ),
+            shape=(quantized_matrix.shape[0], len(columns))
+        )
+        query_part = query_vectors[:, columns].astype(np.float32)
+        
+        dots = (query_part @ document_part.T).toarray()
+        query_norms = np.sqrt(np.asarray(query_part.power(2).sum(axis=1)).ravel())
+    else:
+        query_part = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        dots = query_part @ codes.astype(np.float32).T
+        query_norms = np.linalg.norm(query_part, axis=1)
+    
+    dots = dots * quantized_matrix.scales
+    norms = np.outer(query_norms, quantized_matrix.norms)
+    
+    similarities = np.zeros_like(dots)
+    np.divide(dots, norms, out=similarities, where=norms > 0)
+    
     return similarities
 
 
@@ -44,4 +121,35 @@ def rank_documents(doc_ids, similarities):
         for rank, (doc_id, score) in enumerate(doc_scores)
     ]
     
-    return ranked_results
\ No newline at end of file
+    return ranked_results
+
+
+def rank_top_k(doc_ids, similarities, k):
+    """
+    Rank only the k best documents by similarity score.
+    
+    Args:
+        doc_ids: List of document IDs
+        similarities: Array of similarity scores
+        k: Number of documents to return
+        
+    Returns:
+        List of tuples: (doc_id, rank, score)
+    """
+    similarities = np.asarray(similarities)
+    
+    # Partial sort: keep every document scoring at least the k-th best score,
+    # so ties at the cutoff are broken by document index like rank_documents
+    if k < len(similarities):
+        kth_score = -np.partition(-similarities, k - 1)[k - 1]
+        candidates = np.flatnonzero(similarities >= kth_score)
+    else:
+        candidates = np.arange(len(similarities))
+    top_indices = candidates[np.lexsort((candidates, -similarities[candidates]))][:k]
+    
+    ranked_results = [
+        (doc_ids[index], rank + 1, similarities[index])
+        for rank, index in enumerate(top_indices)
+    ]
+    
+    return ranked_results
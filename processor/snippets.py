@@ -0,0 +1,188 @@
+"""
+Snippet Generation
+Builds query-biased snippets with highlighted terms from stored text
+"""
+
+import html
+import re
+import time
+from sklearn.feature_extraction.text import TfidfVectorizer
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import USE_LOWERCASE, STOP_WORDS, SNIPPET_WINDOW, SNIPPET_TIME_BUDGET_MS
+from processor.query_processor import expand_query_terms
+
+# Same token pattern as TfidfVectorizer, so highlights match indexed terms
+TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+# Rough word length used to turn the word window into a character span
+CHARS_PER_WORD = 8
+
+# Text is scanned in segments of this many characters so the time budget
+# is checked even when there are no hits
+SCAN_SEGMENT_CHARS = 16384
+NON_WORD_PATTERN = re.compile(r'(?u)\W')
+
+
+def get_highlight_terms(query_text, spelling_index=None):
+    """
+    Get the set of terms to highlight for a query.
+
+    Args:
+        query_text: The search query
+        spelling_index: Optional spelling index used to add corrected terms
+
+    Returns:
+        Set of lowercase terms
+    """
+    analyzer = TfidfVectorizer(lowercase=USE_LOWERCASE, stop_words=STOP_WORDS).build_analyzer()
+    terms = analyzer(query_text)
+
+    highlight_terms = set(terms)
+    if spelling_index is not None:
+        highlight_terms.update(expand_query_terms(terms, spelling_index))
+
+    return highlight_terms
+
+
+def compile_highlight_pattern(highlight_terms):
+    """
+    Compile one alternation regex that matches any of the terms.
+
+    Word boundaries are checked separately by find_hits, since a plain
+    literal alternation over lowercased text scans much faster than
+    case-insensitive matching with \\b anchors.
+    """
+    alternatives = '|'.join(re.escape(term) for term in sorted(highlight_terms, key=len, reverse=True))
+    return re.compile(alternatives)
+
+
+def is_word_char(char):
+    """Same definition of a word character as \\w in regular expressions"""
+    return char.isalnum() or char == '_'
+
+
+def find_hits(segment, offset, pattern):
+    """
+    Find whole-word occurrences of the highlight terms in a text segment.
+
+    Args:
+        segment: Text that starts and ends on word boundaries
+        offset: Position of the segment in the full text
+        pattern: Pattern from compile_highlight_pattern
+
+    Returns:
+        List of tuples: (position, term)
+    """
+    search_text = segment.lower() if USE_LOWERCASE else segment
+
+    # Lowercasing some characters changes the length, which would shift offsets
+    if len(search_text) != len(segment):
+        fallback = re.compile(r'(?u)\b(?:' + pattern.pattern + r')\b', re.IGNORECASE)
+        return [(offset + match.start(), match.group().lower()) for match in fallback.finditer(segment)]
+
+    hits = []
+    for match in pattern.finditer(search_text):
+        start, stop = match.span()
+        if start > 0 and is_word_char(segment[start - 1]):
+            continue
+        if stop < len(segment) and is_word_char(segment[stop]):
+            continue
+        hits.append((offset + start, match.group()))
+
+    return hits
+
+
+def generate_snippet(text, highlight_terms, window=SNIPPET_WINDOW,
+                     time_budget_ms=SNIPPET_TIME_BUDGET_MS):
+    """
+    Generate a query-biased snippet with highlighted terms.
+
+    Only the query terms are searched for, and the window covering the most
+    distinct terms wins. If scanning runs past the time budget, the best
+    window among the hits found so far is used.
+
+    Args:
+        text: Document text
+        highlight_terms: Set of terms to highlight
+        window: Number of words in the snippet
+        time_budget_ms: Maximum time spent scanning the document
+
+    Returns:
+        HTML string with matches wrapped in <mark> tags
+    """
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    window_chars = window * CHARS_PER_WORD
+
+    # Character offsets of query term hits
+    hits = []
+    if highlight_terms:
+        pattern = compile_highlight_pattern(highlight_terms)
+        position = 0
+        while position < len(text) and time.perf_counter() <= deadline:
+            # End each segment on a non-word character so no word is split
+            boundary = NON_WORD_PATTERN.search(text, position + SCAN_SEGMENT_CHARS)
+            segment_end = boundary.start() if boundary else len(text)
+
+            hits.extend(find_hits(text[position:segment_end], position, pattern))
+            position = segment_end + 1
+
+    # Slide a window over the hits, preferring more distinct terms, then the
+    # tightest cluster, then more hits. The snippet shows a few words of
+    # context before the anchor, so hits must fit in the rest of the window.
+    hit_span_chars = (window - window // 4) * CHARS_PER_WORD
+    anchor = 0
+    best_score = (0, 0, 0)
+    end = 0
+    for begin in range(len(hits)):
+        while end < len(hits) and hits[end][0] < hits[begin][0] + hit_span_chars:
+            end += 1
+        in_window = hits[begin:end]
+        span = in_window[-1][0] - in_window[0][0]
+        score = (len({token for _, token in in_window}), -span, len(in_window))
+        if score > best_score:
+            best_score = score
+            anchor = hits[begin][0]
+
+    # Tokenize only the region around the chosen window
+    region_start = max(0, anchor - window_chars)
+    region_end = min(len(text), anchor + 2 * window_chars)
+    spans = [
+        (match.start() + region_start, match.end() + region_start)
+        for match in TOKEN_PATTERN.finditer(text[region_start:region_end])
+    ]
+    # The region edges may cut through a word
+    if region_start > 0 and spans:
+        spans = spans[1:]
+    if not spans:
+        return ""
+
+    # Start a little before the first hit so it has some context
+    anchor_position = next(
+        (position for position, (start, _) in enumerate(spans) if start >= anchor),
+        len(spans) - 1
+    )
+    first = max(0, min(anchor_position - window // 4, len(spans) - window))
+    last = min(len(spans), first + window) - 1
+
+    parts = []
+    cursor = spans[first][0]
+    for position in range(first, last + 1):
+        start, stop = spans[position]
+        token = text[start:stop]
+        parts.append(html.escape(text[cursor:start]))
+        if (token.lower() if USE_LOWERCASE else token) in highlight_terms:
+            parts.append('<mark>' + html.escape(token) + '</mark>')
+        else:
+            parts.append(html.escape(token))
+        cursor = stop
+
+    snippet = ''.join(parts)
+    if spans[first][0] > 0 and (first > 0 or region_start > 0):
+        snippet = '... ' + snippet
+    if TOKEN_PATTERN.search(text, spans[last][1]) is not None:
+        snippet = snippet + ' ...'
+
+    return snippet
@@ -4,7 +4,12 @@ Uses word embeddings for semantic similarity
 """
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from indexer.quantization import quantize_vectors
+from processor.similarity import compute_cosine_similarity, rank_documents
 
 # Fix gensim import for different versions
 try:
@@ -46,26 +51,41 @@ def get_document_embedding(text, model):
         return np.zeros(model.vector_size)
 
 
-def create_document_embeddings(documents):
-    """Create embeddings for all documents"""
+def create_document_embeddings(documents, quantization=None):
+    """
+    Create embeddings for all documents.
+    
+    Args:
+        documents: Dictionary mapping document ID to text
+        quantization: Optional 'float16' or 'int8' storage for the embeddings
+        
+    Returns:
+        Tuple of (doc_ids, embeddings), one embedding row per document ID;
+        embeddings is a QuantizedMatrix when quantization is set
+    """
     model = load_word2vec_model()
-    doc_embeddings = {}
+    doc_ids = list(documents.keys())
     
     print("Creating document embeddings...")
-    for doc_id, text in documents.items():
-        embedding = get_document_embedding(text, model)
-        doc_embeddings[doc_id] = embedding
+    doc_embeddings = np.zeros((len(doc_ids), model.vector_size))
+    for row, doc_id in enumerate(doc_ids):
+        doc_embeddings[row] = get_document_embedding(documents[doc_id], model)
+    
+    if quantization is not None:
+        doc_embeddings = quantize_vectors(doc_embeddings, quantization)
+        print(f"Document embeddings quantized to {quantization}")
     
-    return doc_embeddings
+    return doc_ids, doc_embeddings
 
 
-def process_query_word2vec(query_text, doc_embeddings):
+def process_query_word2vec(query_text, doc_ids, doc_embeddings):
     """
     Rank documents using Word2Vec semantic similarity.
     
     Args:
         query_text: Search query
-        doc_embeddings: Dictionary of document embeddings
+        doc_ids: List of document IDs, one per embedding row
+        doc_embeddings: Embedding matrix (may be quantized)
         
     Returns:
         List of tuples: (doc_id, rank, score)
@@ -75,21 +95,7 @@ def process_query_word2vec(query_text, doc_embeddings):
     # Get query embedding
     query_embedding = get_document_embedding(query_text, model)
     
-    # Compute similarities
-    similarities = []
-    for doc_id, doc_embedding in doc_embeddings.items():
-        similarity = cosine_similarity(
-            query_embedding.reshape(1, -1),
-            doc_embedding.reshape(1, -1)
-        )[0][0]
-        similarities.append((doc_id, similarity))
-    
-    # Sort and rank
-    similarities.sort(key=lambda x: x[1], reverse=True)
-    
-    ranked_results = [
-        (doc_id, rank + 1, score)
-        for rank, (doc_id, score) in enumerate(similarities)
-    ]
+    # Compute similarities and rank
+    similarities = compute_cosine_similarity(query_embedding.reshape(1, -1), doc_embeddings)
     
-    return ranked_results
\ No newline at end of file
+    return rank_documents(doc_ids, similarities)